@@ -35,21 +35,117 @@ CLI Endpoints Overview:
    - Command: process-video <video_file>
    - Purpose: Extracts audio from video and transcribes it
    - Example: python cli.py process-video "data/raw/video.mp4"
+
+8. process-and-transcribe (Convert and Transcribe Audio Files)
+   - Command: process-and-transcribe <input_dir> <output_dir>
+   - Purpose: Converts .opus files to WAV and transcribes them, overlapping ffmpeg with Whisper
+   - Example: python cli.py process-and-transcribe "data/raw" "data/transcribed"
 """
 
+import errno
+import fnmatch
+import functools
 import glob
+import os
 import re
 import shutil
+import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Literal
+from typing import BinaryIO, Iterator, List, Literal
 
 import click
+from faster_whisper import WhisperModel
 from loguru import logger
 
 sys.path.append(str(Path(__file__).parent))  # Ensure main.py can be imported
 
-from main import extract_audio_from_mp4, transcribe_audio, PROCESSED_DIR, TRANSCRIBED_DIR
+from main import (
+    FFMPEG_CMD,
+    decode_audio,
+    extract_audio_from_mp4,
+    load_model,
+    prefetch,
+    scan_files,
+    transcribe_audio,
+    SAMPLE_RATE,
+    TRANSCRIBED_DIR,
+)
+
+# Timestamp formats stripped by the clean command. Kept as bytes so transcripts can be
+# cleaned without decoding them, since the timestamps themselves are pure ASCII.
+TIMESTAMP_FORMATS = [
+    # Whisper segments, e.g. [00:00:00.000 -> 00:00:08.160]
+    rb"\[\d{2}:\d{2}:\d{2}\.\d{3} -> \d{2}:\d{2}:\d{2}\.\d{3}\]",
+    # WebVTT cues, e.g. 00:00:00.000 --> 00:00:08.160 (hours optional)
+    rb"(?:\d{2}:)?\d{2}:\d{2}\.\d{3} --> (?:\d{2}:)?\d{2}:\d{2}\.\d{3}",
+    # SRT cues, e.g. 00:00:00,000 --> 00:00:08,160
+    rb"\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3}",
+]
+
+# All formats compiled into one alternation so each line is matched in a single call.
+# Anchored so lines without a leading timestamp are rejected at the first character.
+TIMESTAMP_RE = re.compile(
+    rb"^[ \t]*(?:"
+    + b"|".join(b"(?:" + fmt + b")" for fmt in TIMESTAMP_FORMATS)
+    + rb")[ \t]*"
+)
+
+# Shape of a Whisper segment timestamp with every digit replaced by 0. Lines whose
+# prefix matches it after _DIGITS_TO_ZERO are stripped by slicing, skipping the regex.
+WHISPER_TIMESTAMP_SHAPE = b"[00:00:00.000 -> 00:00:00.000]"
+WHISPER_TIMESTAMP_LEN = len(WHISPER_TIMESTAMP_SHAPE)
+_DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"000000000")
+
+# Bytes that str.strip treats as whitespace but bytes.strip does not: the ASCII
+# separators 0x1c-0x1f and any byte of a multi-byte UTF-8 character such as NBSP
+_STR_ONLY_WHITESPACE = frozenset(range(0x1C, 0x20)) | frozenset(range(0x80, 0x100))
+
+# Chunk size used when streaming transcripts into a concatenated file
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Maximum number of files converted by a single ffmpeg process in the process command
+FFMPEG_BATCH_SIZE = 16
+
+# Chunk size read at a time by the clean command
+CLEAN_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_glob(pattern: str) -> re.Pattern[str]:
+    """Compile a shell-style filename pattern into a case-sensitive regex."""
+    return re.compile(fnmatch.translate(pattern))
+
+
+def _iter_matching_files(source_pattern: str) -> Iterator[str]:
+    """Yield the paths of regular files matching a glob pattern as they are found.
+
+    When the wildcards are confined to the basename, the parent directory is scanned
+    once with os.scandir and names are matched with a cached regex. Patterns with
+    wildcards in the directory part fall back to glob.glob, listing every match
+    before any is yielded so files moved into a matching directory aren't found again.
+    """
+    parent, name_pattern = os.path.split(source_pattern)
+    if glob.has_magic(parent):
+        yield from [path for path in glob.glob(source_pattern) if os.path.isfile(path)]
+        return
+
+    include_hidden = name_pattern.startswith(".")
+    match_name = _compile_glob(name_pattern).match
+    try:
+        entries = os.scandir(parent or ".")
+    except OSError:
+        # Like glob, a parent that can't be listed simply has no matches
+        return
+    with entries:
+        for entry in entries:
+            if (
+                (include_hidden or not entry.name.startswith("."))
+                and match_name(entry.name)
+                and entry.is_file()
+            ):
+                yield entry.path
 
 
 @click.group()
@@ -79,15 +175,42 @@ def mv(source_pattern: str, target_dir: str) -> None:
     target_path = Path(target_dir)
     target_path.mkdir(parents=True, exist_ok=True)
 
-    # Get all files matching the pattern
-    files: List[str] = glob.glob(source_pattern)
+    target_dir_str = str(target_path)
+
+    # Move files as the pattern matches them rather than listing them all first
+    for file_path in _iter_matching_files(source_pattern):
+        filename = os.path.basename(file_path)
+        target_file = os.path.join(target_dir_str, filename)
+        try:
+            os.replace(file_path, target_file)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            # Fall back to copy and delete when moving across filesystems
+            shutil.move(file_path, target_file)
+        click.echo(f"Moved {filename} to {target_dir}")
+
+
+def _append_file(infile: BinaryIO, outfile: BinaryIO) -> None:
+    """Append the contents of infile to outfile.
 
-    for file_path in files:
-        if Path(file_path).is_file():
-            filename = Path(file_path).name
-            target_file = target_path / filename
-            shutil.move(file_path, str(target_file))
-            click.echo(f"Moved {filename} to {target_dir}")
+    On Linux, os.sendfile copies the data inside the kernel. Elsewhere sendfile needs
+    a socket as its output, so shutil.copyfileobj is used instead, as it is when
+    sendfile is unsupported for these files.
+    """
+    if sys.platform == "linux":
+        in_fd = infile.fileno()
+        out_fd = outfile.fileno()
+        copied = 0
+        try:
+            while sent := os.sendfile(out_fd, in_fd, None, COPY_BUFFER_SIZE):
+                copied += sent
+            return
+        except OSError:
+            # Only safe to fall back if nothing has been written yet
+            if copied:
+                raise
+    shutil.copyfileobj(infile, outfile, COPY_BUFFER_SIZE)
 
 
 @cli.command("concat")
@@ -115,18 +238,67 @@ def concatenate_files(source_dir: str, output: str | None) -> None:
         output = Path(output)
 
     # Get all .txt files in the directory
-    files = list(source_path.glob("*.txt"))
-    files.sort()  # Sort files for consistent ordering
+    files = scan_files(source_path, ".txt")
+    files.sort(key=lambda entry: entry.name)  # Sort files for consistent ordering
 
-    with output.open("w") as outfile:
+    # Unbuffered on both ends: sendfile and the separator writes share the same file
+    # offset, and the fallback copy already moves COPY_BUFFER_SIZE bytes per syscall
+    with output.open("wb", buffering=0) as outfile:
         for file_path in files:
-            with file_path.open("r") as infile:
-                outfile.write(infile.read())
-                outfile.write("\n")  # Add newline between files
+            with open(file_path.path, "rb", buffering=0) as infile:
+                _append_file(infile, outfile)
+                outfile.write(b"\n")  # Add newline between files
 
     click.echo(f"Concatenated files to {output}")
 
 
+def _clean_block(data: bytes) -> tuple[bytes, int, int, int]:
+    """Remove timestamps and empty lines from a block of whole lines.
+
+    Args:
+        data: Transcript bytes made up of complete lines
+
+    Returns:
+        Tuple of (cleaned bytes, total lines, lines with timestamps, lines removed)
+    """
+    match_timestamp = TIMESTAMP_RE.match
+    lines = data.splitlines()
+    kept = []
+    n_timestamps = 0
+    # Plain ASCII blocks, the common case, never need the slower text strip below
+    check_edges = not data.isascii() or any(
+        separator in data for separator in (b"\x1c", b"\x1d", b"\x1e", b"\x1f")
+    )
+    for line in lines:
+        # Whisper's fixed-width prefix is checked by slicing; other formats use the regex
+        prefix = line[:WHISPER_TIMESTAMP_LEN]
+        if prefix.translate(_DIGITS_TO_ZERO) == WHISPER_TIMESTAMP_SHAPE:
+            line = line[WHISPER_TIMESTAMP_LEN:]
+            n_timestamps += 1
+        elif match := match_timestamp(line):
+            line = line[match.end():]
+            n_timestamps += 1
+        stripped = line.strip()
+        if (
+            check_edges
+            and stripped
+            and (
+                stripped[0] in _STR_ONLY_WHITESPACE
+                or stripped[-1] in _STR_ONLY_WHITESPACE
+            )
+        ):
+            # bytes.strip only knows ASCII whitespace; trim e.g. NBSP as text instead
+            text = stripped.decode("utf-8", "surrogateescape").strip()
+            stripped = text.encode("utf-8", "surrogateescape")
+        if stripped:
+            kept.append(stripped)
+    n_kept = len(kept)
+    if kept:
+        # Join onto a trailing empty item so the final newline needs no extra copy
+        kept.append(b"")
+    return b"\n".join(kept), len(lines), n_timestamps, len(lines) - n_kept
+
+
 @cli.command("clean")
 @click.argument("input_file")
 @click.option("--output", "-o", help="Output file path")
@@ -158,24 +330,28 @@ def remove_timestamps(input_file: str, output: str | None) -> None:
     else:
         output = Path(output)
 
-    # Pattern to match timestamps like [00:00:00.000 -> 00:00:08.160]
-    timestamp_pattern = r"\[\d{2}:\d{2}:\d{2}\.\d{3} -> \d{2}:\d{2}:\d{2}\.\d{3}\]"
-
     total_lines = 0
     lines_with_timestamps = 0
     lines_removed = 0
 
-    with input_path.open("r") as infile, output.open("w") as outfile:
-        for line in infile:
-            total_lines += 1
-            if re.search(timestamp_pattern, line):
-                lines_with_timestamps += 1
-            # Remove timestamp and clean up the line
-            clean_line = re.sub(timestamp_pattern, "", line).strip()
-            if clean_line:  # Only write non-empty lines
-                outfile.write(clean_line + "\n")
-            else:
-                lines_removed += 1
+    with input_path.open("rb") as infile, output.open("wb") as outfile:
+        remainder = b""
+        while chunk := infile.read(CLEAN_CHUNK_SIZE):
+            # Only clean whole lines; carry the trailing partial line into the next chunk
+            chunk = remainder + chunk
+            cut = chunk.rfind(b"\n") + 1
+            remainder = chunk[cut:]
+            cleaned, n_lines, n_timestamps, n_removed = _clean_block(chunk[:cut])
+            outfile.write(cleaned)
+            total_lines += n_lines
+            lines_with_timestamps += n_timestamps
+            lines_removed += n_removed
+
+        cleaned, n_lines, n_timestamps, n_removed = _clean_block(remainder)
+        outfile.write(cleaned)
+        total_lines += n_lines
+        lines_with_timestamps += n_timestamps
+        lines_removed += n_removed
 
     logger.info(f"Processed {total_lines} lines")
     logger.info(f"Found {lines_with_timestamps} lines with timestamps")
@@ -185,18 +361,113 @@ def remove_timestamps(input_file: str, output: str | None) -> None:
     click.echo(f"Removed timestamps from {input_path} to {output}")
 
 
+def _convert_one(opus_file: os.DirEntry, wav_file: Path) -> bool:
+    """Convert a single .opus file to a 16kHz mono .wav file with ffmpeg.
+
+    Returns:
+        True if the conversion succeeded, False otherwise
+    """
+    try:
+        # Use convert_opus_to_wav but override output dir
+        cmd = [
+            *FFMPEG_CMD,
+            "-f",
+            "ogg",
+            "-i",
+            opus_file.path,
+            "-acodec",
+            "pcm_s16le",
+            "-ar",
+            "16000",
+            "-ac",
+            "1",
+            str(wav_file),
+        ]
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            # Only decode stderr when it is actually going to be logged
+            stderr = result.stderr.decode("utf-8", errors="replace")
+            logger.error(f"FFmpeg conversion failed for {opus_file.name}: {stderr}")
+            return False
+        logger.success(f"Converted {opus_file.name} to {wav_file.name}")
+        return True
+    except Exception as e:
+        logger.error(f"Error converting {opus_file.name}: {str(e)}")
+        return False
+
+
+def _convert_batch(opus_files: List[os.DirEntry], wav_files: List[Path]) -> List[bool]:
+    """Convert several .opus files with a single ffmpeg process.
+
+    Amortizes ffmpeg's process start-up and codec initialization across the batch.
+    If the batch fails, its files are retried one at a time so a single bad input
+    doesn't fail the rest.
+
+    Returns:
+        Whether each conversion succeeded, in input order
+    """
+    if len(opus_files) == 1:
+        return [_convert_one(opus_files[0], wav_files[0])]
+
+    try:
+        cmd = list(FFMPEG_CMD)
+        for opus_file in opus_files:
+            cmd += ["-f", "ogg", "-i", opus_file.path]
+        for index, wav_file in enumerate(wav_files):
+            cmd += [
+                "-map",
+                f"{index}:a:0",
+                "-acodec",
+                "pcm_s16le",
+                "-ar",
+                "16000",
+                "-ac",
+                "1",
+                str(wav_file),
+            ]
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if result.returncode == 0:
+            for opus_file, wav_file in zip(opus_files, wav_files):
+                logger.success(f"Converted {opus_file.name} to {wav_file.name}")
+            return [True] * len(opus_files)
+    except Exception as e:
+        logger.warning(f"Error converting batch of {len(opus_files)} files: {str(e)}")
+
+    logger.warning(
+        f"Batch conversion of {len(opus_files)} files failed, retrying one at a time"
+    )
+    for wav_file in wav_files:
+        # Remove partial outputs so the retries don't trip over them
+        wav_file.unlink(missing_ok=True)
+    return [
+        _convert_one(opus_file, wav_file)
+        for opus_file, wav_file in zip(opus_files, wav_files)
+    ]
+
+
 @cli.command("process")
 @click.argument("input_dir")
 @click.argument("output_dir")
 @click.option("--filetype", "-f", help="File type to process", default="opus")
+@click.option(
+    "--workers",
+    "-j",
+    type=click.IntRange(min=1),
+    default=os.cpu_count(),
+    help="Number of concurrent ffmpeg conversions",
+)
 def process(
-    input_dir: str, output_dir: str, filetype: Literal["ogg", "opus"] = "opus"
+    input_dir: str,
+    output_dir: str,
+    filetype: Literal["ogg", "opus"] = "opus",
+    workers: int | None = None,
 ) -> None:
     """Process all .opus audio files in a directory, converting them to .wav files in the output directory.
 
     Args:
         input_dir: Directory containing .opus files (e.g., "data/raw")
         output_dir: Directory to save .wav files (e.g., "data/processed")
+        workers: Number of ffmpeg conversions to run at once (default: number of CPUs)
 
     Example:
         $ python cli.py process "data/raw" "data/processed"
@@ -205,65 +476,103 @@ def process(
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    opus_files = list(input_path.glob("*.opus"))
+    opus_files = scan_files(input_path, ".opus")
     if not opus_files:
         logger.warning(f"No .opus files found in {input_dir}")
         click.echo(f"No .opus files found in {input_dir}")
         return
 
-    processed = 0
+    # One scan of the output directory instead of an exists() check per file
+    existing = {entry.name for entry in scan_files(output_path, ".wav")}
+
     skipped = 0
-    failed = 0
+    pending: List[os.DirEntry] = []
+    wav_files: List[Path] = []
 
     for opus_file in opus_files:
-        wav_file = output_path / f"{opus_file.stem}.wav"
-        if wav_file.exists():
+        wav_name = f"{os.path.splitext(opus_file.name)[0]}.wav"
+        if wav_name in existing:
             logger.info(f"WAV file already exists for {opus_file.name}, skipping.")
             skipped += 1
             continue
-        try:
-            # Use convert_opus_to_wav but override output dir
-            cmd = [
-                "ffmpeg",
-                "-f",
-                "ogg",
-                "-i",
-                str(opus_file),
-                "-acodec",
-                "pcm_s16le",
-                "-ar",
-                "16000",
-                "-ac",
-                "1",
-                str(wav_file),
-            ]
-            import subprocess
-
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                logger.error(
-                    f"FFmpeg conversion failed for {opus_file.name}: {result.stderr}"
-                )
-                failed += 1
-                continue
-            logger.success(f"Converted {opus_file.name} to {wav_file.name}")
-            processed += 1
-        except Exception as e:
-            logger.error(f"Error converting {opus_file.name}: {str(e)}")
-            failed += 1
-            continue
+        pending.append(opus_file)
+        wav_files.append(output_path / wav_name)
+
+    # Batch files into as few ffmpeg runs as possible while still giving every
+    # worker something to do
+    n_workers = workers or os.cpu_count() or 1
+    batch_size = max(1, min(FFMPEG_BATCH_SIZE, -(-len(pending) // n_workers)))
+    starts = range(0, len(pending), batch_size)
+    opus_batches = [pending[i : i + batch_size] for i in starts]
+    wav_batches = [wav_files[i : i + batch_size] for i in starts]
+
+    # ffmpeg does the work in a child process, so threads are enough to keep all cores busy
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        results = [
+            succeeded
+            for batch in executor.map(_convert_batch, opus_batches, wav_batches)
+            for succeeded in batch
+        ]
+
+    processed = sum(results)
+    failed = len(results) - processed
 
     click.echo(
         f"Processing complete. Converted: {processed}, Skipped: {skipped}, Failed: {failed}"
     )
 
 
+def _transcribe_one(
+    wav_file: os.PathLike[str],
+    transcript_file: Path,
+    model_str: str,
+    timestamps: bool,
+    whisper_model: WhisperModel | None = None,
+) -> bool:
+    """Transcribe a single .wav file and save the transcript.
+
+    Args:
+        whisper_model: Loaded model to use. If not provided, the model cached by
+            transcribe_audio is used
+
+    Returns:
+        True if the transcription succeeded, False otherwise
+    """
+    wav_file = Path(wav_file)
+    try:
+        transcript = transcribe_audio(
+            wav_file,
+            model_str=model_str,
+            timestamps=timestamps,
+            model=whisper_model,
+        )
+        transcript_file.write_text(transcript)
+        logger.success(f"Transcribed {wav_file.name}")
+        return True
+    except Exception as e:
+        logger.error(f"Error transcribing {wav_file.name}: {str(e)}")
+        return False
+
+
 @cli.command("transcribe")
 @click.argument("input_dir")
 @click.argument("output_dir")
 @click.option("--model", "-m", help="Whisper model size", default="base")
 @click.option("--timestamps/--no-timestamps", default=True, help="Include timestamps in output")
-def transcribe(input_dir: str, output_dir: str, model: str = "base", timestamps: bool = True) -> None:
+@click.option(
+    "--workers",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of concurrent transcriptions sharing one model",
+)
+def transcribe(
+    input_dir: str,
+    output_dir: str,
+    model: str = "base",
+    timestamps: bool = True,
+    workers: int = 1,
+) -> None:
     """Transcribe all .wav audio files in a directory using Whisper.
 
     Args:
@@ -271,6 +580,8 @@ def transcribe(input_dir: str, output_dir: str, model: str = "base", timestamps:
         output_dir: Directory to save transcript files (e.g., "data/transcribed")
         model: Whisper model size (tiny, base, small, medium, large)
         timestamps: Include timestamps in the transcription output
+        workers: Number of files to transcribe at once. The model is loaded once and
+            shared by all workers
 
     Example:
         $ python cli.py transcribe "data/processed" "data/transcribed"
@@ -279,35 +590,148 @@ def transcribe(input_dir: str, output_dir: str, model: str = "base", timestamps:
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    wav_files = list(input_path.glob("*.wav"))
+    wav_files = scan_files(input_path, ".wav")
     if not wav_files:
         logger.warning(f"No .wav files found in {input_dir}")
         click.echo(f"No .wav files found in {input_dir}")
         return
 
-    processed = 0
+    # One scan of the output directory instead of an exists() check per file
+    existing = {entry.name for entry in scan_files(output_path, ".txt")}
+
     skipped = 0
-    failed = 0
+    pending: List[os.DirEntry] = []
+    transcript_files: List[Path] = []
 
     for wav_file in wav_files:
-        transcript_file = output_path / f"{wav_file.stem}.txt"
-        if transcript_file.exists():
+        transcript_name = f"{os.path.splitext(wav_file.name)[0]}.txt"
+        if transcript_name in existing:
             logger.info(f"Transcript already exists for {wav_file.name}, skipping.")
             skipped += 1
             continue
-        
+        pending.append(wav_file)
+        transcript_files.append(output_path / transcript_name)
+
+    results: List[bool] = []
+    if pending:
         try:
-            transcript = transcribe_audio(wav_file, model_str=model, timestamps=timestamps)
-            transcript_file.write_text(transcript)
-            logger.success(f"Transcribed {wav_file.name}")
-            processed += 1
+            whisper_model = load_model(model, num_workers=workers)
         except Exception as e:
-            logger.error(f"Error transcribing {wav_file.name}: {str(e)}")
+            logger.error(f"Failed to load Whisper model {model}: {str(e)}")
+            click.echo(f"Error: Failed to load Whisper model {model}: {str(e)}")
+            return
+
+        # faster-whisper models can be shared between threads; num_workers lets the
+        # transcriptions actually run in parallel inside CTranslate2
+        transcribe_file = functools.partial(
+            _transcribe_one,
+            model_str=model,
+            timestamps=timestamps,
+            whisper_model=whisper_model,
+        )
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(transcribe_file, pending, transcript_files))
+
+    processed = sum(results)
+    failed = len(results) - processed
+
+    click.echo(
+        f"Transcription complete. Processed: {processed}, Skipped: {skipped}, Failed: {failed}"
+    )
+
+
+@cli.command("process-and-transcribe")
+@click.argument("input_dir")
+@click.argument("output_dir")
+@click.option("--model", "-m", help="Whisper model size", default="base")
+@click.option("--timestamps/--no-timestamps", default=True, help="Include timestamps in output")
+@click.option(
+    "--wav-dir", help="Directory for intermediate WAV files", default="data/processed"
+)
+@click.option(
+    "--keep-intermediates",
+    is_flag=True,
+    default=False,
+    help="Keep the intermediate WAV files after transcription",
+)
+def process_and_transcribe(
+    input_dir: str,
+    output_dir: str,
+    model: str = "base",
+    timestamps: bool = True,
+    wav_dir: str = "data/processed",
+    keep_intermediates: bool = False,
+) -> None:
+    """Convert and transcribe all .opus files in a directory in one overlapped pass.
+
+    A background thread runs ffmpeg on the next file while Whisper transcribes the
+    current one, so the total time per file approaches the slower of the two steps
+    rather than their sum.
+
+    Args:
+        input_dir: Directory containing .opus files (e.g., "data/raw")
+        output_dir: Directory to save transcript files (e.g., "data/transcribed")
+        model: Whisper model size (tiny, base, small, medium, large)
+        timestamps: Include timestamps in the transcription output
+        wav_dir: Directory for the intermediate .wav files (default: data/processed)
+        keep_intermediates: Keep the .wav files created by this command
+
+    Example:
+        $ python cli.py process-and-transcribe "data/raw" "data/transcribed"
+    """
+    input_path = Path(input_dir)
+    output_path = Path(output_dir)
+    wav_path = Path(wav_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    wav_path.mkdir(parents=True, exist_ok=True)
+
+    opus_files = scan_files(input_path, ".opus")
+    if not opus_files:
+        logger.warning(f"No .opus files found in {input_dir}")
+        click.echo(f"No .opus files found in {input_dir}")
+        return
+
+    existing_transcripts = {entry.name for entry in scan_files(output_path, ".txt")}
+    existing_wavs = {entry.name for entry in scan_files(wav_path, ".wav")}
+
+    skipped = 0
+    pending: List[os.DirEntry] = []
+    for opus_file in opus_files:
+        stem = os.path.splitext(opus_file.name)[0]
+        if f"{stem}.txt" in existing_transcripts:
+            logger.info(f"Transcript already exists for {opus_file.name}, skipping.")
+            skipped += 1
+            continue
+        pending.append(opus_file)
+
+    # Returns the WAV file, or None if conversion failed, and whether it was created
+    def convert(opus_file: os.DirEntry) -> tuple[Path | None, bool]:
+        wav_name = f"{os.path.splitext(opus_file.name)[0]}.wav"
+        wav_file = wav_path / wav_name
+        if wav_name in existing_wavs:
+            return wav_file, False
+        if _convert_one(opus_file, wav_file):
+            return wav_file, True
+        return None, False
+
+    processed = 0
+    failed = 0
+
+    # ffmpeg never runs more than a couple of files ahead of Whisper
+    for _, (wav_file, created) in prefetch(pending, convert):
+        if wav_file is None:
             failed += 1
             continue
+        transcript_file = output_path / f"{wav_file.stem}.txt"
+        if _transcribe_one(wav_file, transcript_file, model, timestamps):
+            processed += 1
+            if created and not keep_intermediates:
+                wav_file.unlink(missing_ok=True)
+        else:
+            failed += 1
 
     click.echo(
-        f"Transcription complete. Processed: {processed}, Skipped: {skipped}, Failed: {failed}"
+        f"Processing complete. Transcribed: {processed}, Skipped: {skipped}, Failed: {failed}"
     )
 
 
@@ -352,7 +776,10 @@ def extract_audio(video_file: str, output_dir: str = "data/processed") -> None:
 @click.option("--model", "-m", help="Whisper model size", default="base")
 @click.option("--timestamps/--no-timestamps", default=True, help="Include timestamps in output")
 def process_video(video_file: str, model: str = "base", timestamps: bool = True) -> None:
-    """Complete video processing: extract audio and transcribe it.
+    """Complete video processing: decode the audio track and transcribe it.
+
+    The audio is piped from ffmpeg straight into Whisper, so no intermediate WAV
+    file is written. Use extract-audio to keep a WAV copy.
 
     Args:
         video_file: Path to the MP4 video file
@@ -375,18 +802,24 @@ def process_video(video_file: str, model: str = "base", timestamps: bool = True)
         click.echo(f"Error: Only MP4 files are supported, got: {video_path.suffix}")
         return
 
+    # Skip the decode entirely when there is nothing left to transcribe
+    transcript_file = TRANSCRIBED_DIR / f"{video_path.stem}.txt"
+    if transcript_file.exists():
+        logger.info(f"Transcript already exists for {video_path.name}")
+        click.echo(f"✓ Transcript already exists: {transcript_file}")
+        return
+
     try:
-        # Step 1: Extract audio
-        click.echo("Step 1: Extracting audio from video...")
-        wav_file = extract_audio_from_mp4(video_path, PROCESSED_DIR)
-        click.echo(f"✓ Audio extracted to: {wav_file}")
+        # Step 1: Decode audio into memory
+        click.echo("Step 1: Decoding audio from video...")
+        audio = decode_audio(video_path)
+        click.echo(f"✓ Audio decoded: {len(audio) / SAMPLE_RATE:.1f} seconds")
 
         # Step 2: Transcribe audio
         click.echo("Step 2: Transcribing audio...")
-        transcribe_audio(wav_file, model_str=model, timestamps=timestamps)
+        transcribe_audio(video_path, model_str=model, timestamps=timestamps, audio=audio)
         
         # The transcript is automatically saved by transcribe_audio function
-        transcript_file = TRANSCRIBED_DIR / f"{wav_file.stem}.txt"
         click.echo(f"✓ Transcript saved to: {transcript_file}")
         
         click.echo("🎉 Video processing completed successfully!")
@@ -1,9 +1,19 @@
+import ctypes
+import multiprocessing
+import os
+import queue
 import subprocess
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Callable, Iterable, Iterator, Literal, TypeVar
 
-import whisper
+import ctranslate2
+import numpy as np
 from dotenv import load_dotenv
+from faster_whisper import WhisperModel
 from loguru import logger
 
 # Load environment variables
@@ -16,6 +26,89 @@ RAW_DIR = DATA_DIR / "raw"
 PROCESSED_DIR = DATA_DIR / "processed"
 TRANSCRIBED_DIR = DATA_DIR / "transcribed"
 
+# Sample rate Whisper expects for its input audio
+SAMPLE_RATE = 16000
+
+# Runtime libraries CTranslate2 needs on a GPU. Its wheels don't bundle them, unlike
+# torch's, so they have to be installed alongside the CUDA driver
+if sys.platform == "win32":
+    CUDA_LIBRARIES = ["cublas64_12.dll", "cudnn_ops64_9.dll"]
+else:
+    CUDA_LIBRARIES = ["libcublas.so.12", "libcudnn_ops.so.9"]
+
+# Common ffmpeg invocation: never read stdin and only report errors. Only global
+# options belong here, as anything per-stream would apply to the first input alone
+# in a batched command; ffmpeg already picks the number of codec threads itself
+FFMPEG_CMD = [
+    "ffmpeg",
+    "-nostdin",
+    "-hide_banner",
+    "-nostats",
+    "-loglevel",
+    "error",
+]
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def scan_files(directory: str | Path, suffix: str) -> list[os.DirEntry]:
+    """Return the regular files in a directory whose name ends with suffix.
+
+    Uses a single os.scandir pass so the cached DirEntry type is reused instead of
+    stat-ing every candidate. Like Path.glob, dotfiles are included and a path that
+    can't be listed (missing, not a directory or unreadable) yields no files.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return [
+                entry
+                for entry in entries
+                if entry.name.endswith(suffix) and entry.is_file()
+            ]
+    except OSError:
+        return []
+
+
+def prefetch(
+    items: Iterable[T], prepare: Callable[[T], R], maxsize: int = 2
+) -> Iterator[tuple[T, R]]:
+    """Yield (item, prepare(item)) pairs, running prepare in a background thread.
+
+    Lets ffmpeg work on the next files while the caller transcribes the current one.
+    The thread runs at most maxsize items ahead, which bounds the memory held by
+    prepared results. An exception raised by prepare is re-raised in the caller once
+    the items prepared before it have been yielded.
+
+    Args:
+        items: Items to prepare, in order
+        prepare: Function run on each item in the background thread
+        maxsize: Maximum number of prepared items waiting to be consumed
+    """
+    prepared: queue.Queue = queue.Queue(maxsize=maxsize)
+    done = object()  # Signals that there are no more items
+    errors: list[BaseException] = []
+
+    def produce() -> None:
+        try:
+            for item in items:
+                prepared.put((item, prepare(item)))
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            prepared.put(done)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+
+    while (pair := prepared.get()) is not done:
+        yield pair
+
+    producer.join()
+    if errors:
+        raise errors[0]
+
 
 def setup_directories():
     """Create necessary directories if they don't exist."""
@@ -27,18 +120,28 @@ def setup_directories():
     logger.info("Directories setup complete")
 
 
-def convert_opus_to_wav(opus_file: Path) -> Path:
-    """Convert a WhatsApp voice note to wav format using ffmpeg."""
+def convert_opus_to_wav(opus_file: Path, existing_wavs: set[str] | None = None) -> Path:
+    """Convert a WhatsApp voice note to wav format using ffmpeg.
+
+    Args:
+        opus_file: Path to the voice note
+        existing_wavs: Names of the files already in the processed directory. When
+            given, it is checked instead of calling stat on the WAV file
+    """
     wav_file = PROCESSED_DIR / f"{opus_file.stem}.wav"
 
-    if wav_file.exists():
+    if existing_wavs is None:
+        already_converted = wav_file.exists()
+    else:
+        already_converted = wav_file.name in existing_wavs
+    if already_converted:
         logger.info(f"WAV file already exists for {opus_file.name}")
         return wav_file
 
     try:
         # Use ffmpeg with explicit Ogg container format
         cmd = [
-            "ffmpeg",
+            *FFMPEG_CMD,
             "-f",
             "ogg",  # Explicitly specify Ogg container format
             "-i",
@@ -52,7 +155,9 @@ def convert_opus_to_wav(opus_file: Path) -> Path:
             str(wav_file),
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = subprocess.run(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+        )
         if result.returncode != 0:
             raise Exception(f"FFmpeg conversion failed: {result.stderr}")
 
@@ -73,10 +178,12 @@ def extract_audio_from_mp4(mp4_file: Path, output_dir: Path = PROCESSED_DIR) ->
     
     try:
         cmd = [
-            "ffmpeg",
+            *FFMPEG_CMD,
             "-i",
             str(mp4_file),
             "-vn",  # No video
+            "-map",
+            "0:a:0",  # Only demux the first audio stream
             "-acodec",
             "pcm_s16le",  # Use 16-bit PCM
             "-ar",
@@ -86,7 +193,9 @@ def extract_audio_from_mp4(mp4_file: Path, output_dir: Path = PROCESSED_DIR) ->
             str(wav_file),
         ]
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = subprocess.run(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+        )
         if result.returncode != 0:
             raise Exception(f"FFmpeg audio extraction failed: {result.stderr}")
         
@@ -97,11 +206,57 @@ def extract_audio_from_mp4(mp4_file: Path, output_dir: Path = PROCESSED_DIR) ->
         raise
 
 
+def decode_audio(media_file: Path, input_format: str | None = None) -> np.ndarray:
+    """Decode the audio track of a media file to 16kHz mono samples using ffmpeg.
+
+    The PCM stream is read straight from ffmpeg's stdout, so no intermediate WAV
+    file is written to disk.
+
+    Args:
+        media_file: Path to the audio or video file
+        input_format: Optional ffmpeg container format to force (e.g. "ogg")
+
+    Returns:
+        Float32 samples in [-1, 1], as expected by Whisper
+    """
+    try:
+        cmd = list(FFMPEG_CMD)
+        if input_format:
+            cmd += ["-f", input_format]
+        cmd += [
+            "-i",
+            str(media_file),
+            "-vn",  # No video
+            "-map",
+            "0:a:0",  # Only demux the first audio stream
+            "-f",
+            "s16le",  # Raw PCM instead of a WAV container
+            "-acodec",
+            "pcm_s16le",  # Use 16-bit PCM
+            "-ar",
+            str(SAMPLE_RATE),  # Set sample rate to 16kHz
+            "-ac",
+            "1",  # Convert to mono
+            "pipe:1",
+        ]
+
+        result = subprocess.run(cmd, capture_output=True)
+        if result.returncode != 0:
+            stderr = result.stderr.decode("utf-8", errors="replace")
+            raise Exception(f"FFmpeg audio decoding failed: {stderr}")
+
+        audio = np.frombuffer(result.stdout, np.int16).astype(np.float32)
+        audio /= 32768.0  # Scale in place rather than allocating a second array
+        return audio
+    except Exception as e:
+        logger.error(f"Error decoding audio from {media_file.name}: {str(e)}")
+        raise
+
+
 def format_timestamp(seconds: float) -> str:
     """Format seconds into HH:MM:SS.mmm format."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    seconds = seconds % 60
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(int(minutes), 60)
     return f"{hours:02d}:{minutes:02d}:{seconds:06.3f}"
 
 
@@ -117,13 +272,15 @@ def format_transcript(segments: list[dict], timestamps: bool = True) -> str:
         Formatted transcript as string
     """
     if timestamps:
-        # Format with timestamps
-        formatted_transcript = ""
+        # Format with timestamps, joining once instead of growing a string per segment
+        lines = []
+        format_ts = format_timestamp  # Local alias skips a global lookup per segment
         for segment in segments:
-            start_time = format_timestamp(segment["start"])
-            end_time = format_timestamp(segment["end"])
+            start_time = format_ts(segment["start"])
+            end_time = format_ts(segment["end"])
             text = segment["text"].strip()
-            formatted_transcript += f"[{start_time} -> {end_time}] {text}\n"
+            lines.append(f"[{start_time} -> {end_time}] {text}\n")
+        formatted_transcript = "".join(lines)
     else:
         # Format as continuous text
         formatted_transcript = " ".join(segment["text"].strip() for segment in segments)
@@ -134,10 +291,74 @@ def format_transcript(segments: list[dict], timestamps: bool = True) -> str:
     return formatted_transcript
 
 
+def _query_cuda_device_count() -> int:
+    """Return the number of CUDA devices CTranslate2 can actually run on.
+
+    CTranslate2 reports devices even when cuBLAS or cuDNN is missing and only fails on
+    the first transcription, so the libraries are loaded here to check first.
+    """
+    device_count = ctranslate2.get_cuda_device_count()
+    if device_count == 0:
+        return 0
+    try:
+        for library in CUDA_LIBRARIES:
+            ctypes.CDLL(library)
+    except OSError as e:
+        logger.warning(
+            f"Found {device_count} CUDA device(s) but can't load {library} ({e}), "
+            "so using the CPU. Install cuBLAS 12 and cuDNN 9 to use the GPU"
+        )
+        return 0
+    return device_count
+
+
+def load_model(
+    model_str: Literal["tiny", "base", "small", "medium", "large"] = "base",
+    num_workers: int = 1,
+    cpu_threads: int = 0,
+) -> WhisperModel:
+    """Load a local faster-whisper model so it can be reused across transcriptions.
+
+    The model runs on the GPU with int8 weights and float16 activations when CUDA and
+    its cuBLAS and cuDNN libraries are available, and with int8 weights on the CPU
+    otherwise.
+
+    Args:
+        model_str: Whisper model size to use
+        num_workers: Number of transcriptions the model can run concurrently when it is
+            shared between threads
+        cpu_threads: Number of threads CTranslate2 uses on the CPU. 0 uses its default
+    """
+    # Checked here rather than at import so forked workers don't inherit CUDA state
+    if _query_cuda_device_count() > 0:
+        device, compute_type = "cuda", "int8_float16"
+    else:
+        device, compute_type = "cpu", "int8"
+    logger.info(f"Loading Whisper model: {model_str} on {device} ({compute_type})")
+    return WhisperModel(
+        model_str,
+        device=device,
+        compute_type=compute_type,
+        num_workers=num_workers,
+        cpu_threads=cpu_threads,
+    )
+
+
+@lru_cache(maxsize=4)
+def _get_model(
+    model_str: Literal["tiny", "base", "small", "medium", "large"] = "base",
+    cpu_threads: int = 0,
+) -> WhisperModel:
+    """Return a Whisper model shared by this process, loading it on first use."""
+    return load_model(model_str, cpu_threads=cpu_threads)
+
+
 def transcribe_audio(
     audio_file: Path,
     model_str: Literal["tiny", "base", "small", "medium", "large"] = "base",
     timestamps: bool = True,
+    model: WhisperModel | None = None,
+    audio: np.ndarray | None = None,
     kwargs: dict[str, Any] = {},
 ) -> str:
     """Transcribe audio using local Whisper model with optional timestamps.
@@ -146,6 +367,9 @@ def transcribe_audio(
         audio_file: Path to the audio file
         model_str: Whisper model size to use
         timestamps: Whether to include timestamps in the output
+        model: Preloaded model. If not provided, a cached model_str model is used
+        audio: Already decoded samples (see decode_audio). If provided, these are
+            transcribed and audio_file is only used to name the transcript
         kwargs: Additional arguments to pass to the Whisper model
 
     Returns:
@@ -159,14 +383,21 @@ def transcribe_audio(
         return transcript_file.read_text()
 
     try:
-        # Load the Whisper model
-        model = whisper.load_model(model_str)
-
-        # Transcribe the audio file
-        result = model.transcribe(str(audio_file), **kwargs)
+        # Reuse the cached Whisper model unless the caller already has one
+        if model is None:
+            model = _get_model(model_str)
+
+        # Transcribe the audio file; segments are generated lazily as decoding runs
+        segments, _ = model.transcribe(
+            audio if audio is not None else str(audio_file), **kwargs
+        )
+        segments = [
+            {"start": segment.start, "end": segment.end, "text": segment.text}
+            for segment in segments
+        ]
 
         # Format the transcript with or without timestamps
-        formatted_transcript = format_transcript(result["segments"], timestamps)
+        formatted_transcript = format_transcript(segments, timestamps)
 
         # Save the transcript
         transcript_file.write_text(formatted_transcript)
@@ -178,35 +409,173 @@ def transcribe_audio(
         raise
 
 
-def process_files(filetype: Literal["ogg", "opus"] = "ogg"):
-    """Process all opus files in the raw directory."""
+def _cuda_device_count() -> int:
+    """Count the CUDA devices without initialising CUDA in this process.
+
+    The query runs in a short-lived child process, so worker processes forked
+    afterwards don't inherit a CUDA context from this one.
+    """
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(_query_cuda_device_count).result()
+
+
+def _init_worker(devices: multiprocessing.Queue) -> None:
+    """Pin a worker process to a single GPU before it loads its model."""
+    os.environ["CUDA_VISIBLE_DEVICES"] = devices.get()
+
+
+def _prepare_audio(
+    opus_file: Path, keep_wav: bool = False, existing_wavs: set[str] | None = None
+) -> tuple[Path, np.ndarray | None]:
+    """Run the ffmpeg step for a single voice note.
+
+    Args:
+        opus_file: Path to the voice note
+        keep_wav: Write a WAV copy to the processed directory and transcribe that,
+            instead of piping the decoded audio straight into Whisper
+        existing_wavs: Names of the files already in the processed directory
+
+    Returns:
+        The audio file to transcribe and, unless keep_wav is set, its decoded samples
+    """
+    if keep_wav:
+        # Convert to WAV and transcribe from disk
+        return convert_opus_to_wav(opus_file, existing_wavs), None
+
+    # Decode in memory, skipping the intermediate WAV file
+    return opus_file, decode_audio(opus_file, input_format="ogg")
+
+
+def _save_transcript(
+    opus_file: Path,
+    audio_file: Path,
+    audio: np.ndarray | None = None,
+    cpu_threads: int = 0,
+) -> None:
+    """Transcribe prepared audio and save the transcript for its voice note."""
+    transcript_file = TRANSCRIBED_DIR / f"{opus_file.stem}.txt"
+
+    # Transcribe
+    logger.info(f"Transcribing {audio_file.name}")
+    model = _get_model(cpu_threads=cpu_threads)
+    transcript = transcribe_audio(audio_file, model=model, audio=audio)
+
+    # Save transcript
+    transcript_file.write_text(transcript)
+    logger.success(f"Saved transcript to {transcript_file}")
+
+
+def _process_one(
+    opus_file: Path,
+    keep_wav: bool = False,
+    existing_wavs: set[str] | None = None,
+    cpu_threads: int = 0,
+) -> None:
+    """Decode and transcribe a single voice note, saving its transcript."""
+    try:
+        audio_file, audio = _prepare_audio(opus_file, keep_wav, existing_wavs)
+        _save_transcript(opus_file, audio_file, audio, cpu_threads)
+    except Exception as e:
+        logger.error(f"Failed to process {opus_file.name}: {str(e)}")
+
+
+def _process_prefetched(
+    tasks: list[Path], keep_wav: bool = False, existing_wavs: set[str] | None = None
+) -> None:
+    """Process voice notes in this process, decoding ahead of transcription.
+
+    A background thread runs ffmpeg for the next files while the current one is
+    being transcribed, so Whisper isn't left idle waiting on decoding.
+    """
+
+    def prepare(opus_file: Path) -> tuple[Path, np.ndarray | None] | None:
+        try:
+            return _prepare_audio(opus_file, keep_wav, existing_wavs)
+        except Exception as e:
+            logger.error(f"Failed to process {opus_file.name}: {str(e)}")
+            return None
+
+    for opus_file, prepared in prefetch(tasks, prepare):
+        if prepared is None:
+            continue
+        audio_file, audio = prepared
+        try:
+            _save_transcript(opus_file, audio_file, audio)
+        except Exception as e:
+            logger.error(f"Failed to process {opus_file.name}: {str(e)}")
+
+
+def process_files(
+    filetype: Literal["ogg", "opus"] = "ogg",
+    workers: int | None = None,
+    keep_wav: bool = False,
+):
+    """Process all opus files in the raw directory across a pool of worker processes.
+
+    Args:
+        filetype: Extension of the voice notes to process
+        workers: Number of worker processes. Defaults to one per GPU when CUDA is
+            available and the number of CPUs otherwise, capped at the number of files
+            to process
+        keep_wav: Keep converted WAV files in the processed directory. By default the
+            audio is decoded in memory and no WAV is written
+
+    With a single worker, files are processed in this process and the next file is
+    decoded in a background thread while the current one is transcribed.
+    """
     opus_files = list(RAW_DIR.glob(f"*.{filetype}"))
     if not opus_files:
         logger.warning(f"No {filetype} files found in raw directory")
         return
 
-    for opus_file in opus_files:
-        try:
-            # Check if transcript already exists
-            transcript_file = TRANSCRIBED_DIR / f"{opus_file.stem}.txt"
-            if transcript_file.exists():
-                logger.info(f"Skipping {opus_file.name} - transcript already exists")
-                continue
+    # List the output directories once instead of checking each file separately
+    existing_transcripts = {entry.name for entry in scan_files(TRANSCRIBED_DIR, ".txt")}
+    existing_wavs = None
+    if keep_wav:
+        existing_wavs = {entry.name for entry in scan_files(PROCESSED_DIR, ".wav")}
 
-            # Convert to WAV
-            wav_file = convert_opus_to_wav(opus_file)
+    tasks = []
+    for opus_file in opus_files:
+        # Check if transcript already exists
+        if f"{opus_file.stem}.txt" in existing_transcripts:
+            logger.info(f"Skipping {opus_file.name} - transcript already exists")
+            continue
+        tasks.append(opus_file)
 
-            # Transcribe
-            logger.info(f"Transcribing {wav_file.name}")
-            transcript = transcribe_audio(wav_file)
+    if not tasks:
+        return
 
-            # Save transcript
-            transcript_file.write_text(transcript)
-            logger.success(f"Saved transcript to {transcript_file}")
+    cpu_count = os.cpu_count() or 1
+    gpu_count = _cuda_device_count()
+    # Each worker loads its own model, so on a GPU there is one worker per device
+    workers = min(workers or gpu_count or cpu_count, len(tasks))
+    if workers == 1:
+        # A single model, e.g. on a GPU: overlap decoding with it in a thread instead
+        _process_prefetched(tasks, keep_wav, existing_wavs)
+        return
 
-        except Exception as e:
-            logger.error(f"Failed to process {opus_file.name}: {str(e)}")
-            continue
+    initializer = None
+    initargs = ()
+    if gpu_count:
+        # Hand each worker one of the visible GPUs, round robin
+        visible = os.environ.get("CUDA_VISIBLE_DEVICES")
+        devices = visible.split(",") if visible else [str(i) for i in range(gpu_count)]
+        device_queue = multiprocessing.Queue()
+        for index in range(workers):
+            device_queue.put(devices[index % len(devices)])
+        initializer, initargs = _init_worker, (device_queue,)
+
+    # Processes rather than threads, so each worker has its own model and thread budget
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=initializer, initargs=initargs
+    ) as executor:
+        process_one = partial(
+            _process_one,
+            keep_wav=keep_wav,
+            existing_wavs=existing_wavs,
+            cpu_threads=max(1, cpu_count // workers),
+        )
+        list(executor.map(process_one, tasks))
 
 
 def main():